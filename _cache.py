@@ -0,0 +1,71 @@
+"""
+Disk-backed cache of LLM responses, so re-running or extending an experiment
+can skip model calls whose answer is already known.
+"""
+
+import hashlib
+import os
+import shelve
+import threading
+from typing import Any
+
+DEFAULT_CACHE_PATH = "results/.llm_cache"
+
+
+def cache_key(model: str, temperature: float, prompt: str, nonce: Any = None) -> str:
+    """
+    Build the cache key of a model call.
+
+    Args:
+        model: Name of the Ollama model
+        temperature: Sampling temperature
+        prompt: Full prompt sent to the model
+        nonce: Extra value telling apart calls that are meant to sample different answers
+               to the same prompt, such as the iteration number (None for no nonce)
+
+    Returns:
+        Hex digest identifying the call
+    """
+    key = f"{model}|{temperature}|{prompt}"
+    if nonce is not None:
+        key += f"|{nonce}"
+    return hashlib.blake2b(key.encode("utf-8")).hexdigest()
+
+
+class ShelveCache:
+    """
+    Persistent key/value cache backed by the standard library shelve module.
+    Access is serialized with a lock so the cache can be shared by worker threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: Path of the shelve database (default: results/.llm_cache)
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._db = shelve.open(path)
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for key, or default if it is not cached."""
+        with self._lock:
+            return self._db.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """Store value under key and flush it to disk, so entries survive an interrupted run."""
+        with self._lock:
+            self._db[key] = value
+            self._db.sync()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._db
+
+    def close(self):
+        """Flush pending writes and close the database."""
+        with self._lock:
+            self._db.close()
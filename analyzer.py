@@ -3,49 +3,143 @@ Statistical analysis and visualization of ATS experiment results.
 Detects potential discrimination patterns in scoring.
 """
 
-import json
-import statistics
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+import io
+import mmap
 import os
 
+import numpy as np
+
+from serialization import json_loads, msgpack_loads
+from stats_kernel import column_stats
+
+SEP = "=" * 80
+SUB = "-" * 80
+
+# Results files at least this large are parsed from a memory map
+MMAP_MIN_BYTES = 64 * 1024 * 1024
+
+
+def _score_or_nan(value: Any) -> float:
+    """Return numeric score values unchanged and anything else (None, strings) as NaN."""
+    return value if isinstance(value, (int, float)) else np.nan
+
 
 class ATSAnalyzer:
     """
     Analyze ATS experiment results to detect potential discrimination.
     """
 
-    def __init__(self, results_file: str = None, results_data: Dict[str, Any] = None):
+    def __init__(self, results_file: str = None, results_data: Dict[str, Any] = None, keep_values: bool = False):
         """
         Initialize analyzer with results from file or data.
 
         Args:
-            results_file: Path to JSON results file
+            results_file: Path to a JSON, msgpack or streamed JSONL results file
             results_data: Pre-loaded results data dictionary
+            keep_values: Whether to keep the per-iteration score values in the aggregated statistics
         """
         if results_data:
             self.data = results_data
+        elif results_file and os.path.exists(results_file) and results_file.endswith(".jsonl"):
+            self.data = self._load_jsonl(results_file)
+        elif results_file and os.path.exists(results_file) and results_file.endswith(".msgpack"):
+            with open(results_file, 'rb') as f:
+                self.data = msgpack_loads(f.read())
         elif results_file and os.path.exists(results_file):
-            with open(results_file, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            self.data = self._load_json(results_file)
         else:
             raise ValueError("Either results_file or results_data must be provided")
 
         self.results = self.data.get("results", [])
         self.metadata = self.data.get("metadata", {})
 
-    def aggregate_by_profile(self) -> Dict[str, Dict[str, Any]]:
+        self.keep_values = keep_values
+
+        # Analysis results are computed lazily and reused by the report and CSV export
+        self._aggregated = None
+        self._total_score_means = None
+        self._discrimination = {}
+
+    @staticmethod
+    def _load_json(results_file: str) -> Dict[str, Any]:
         """
-        Aggregate results by profile, calculating statistics for each.
+        Load a JSON results file. Large files are parsed straight from a read-only
+        memory map instead of first being copied into a bytes object.
+
+        Args:
+            results_file: Path to the JSON results file
 
         Returns:
-            Dictionary mapping profile_id to aggregated statistics
+            The decoded results data
+        """
+        with open(results_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+                return json_loads(f.read())
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    return json_loads(view)
+                finally:
+                    view.release()
+
+    @staticmethod
+    def _iter_jsonl(results_file: str):
+        """
+        Lazily yield the records of a streamed JSONL results file.
+        A truncated last line (left behind by an interrupted run) ends the stream.
+
+        Args:
+            results_file: Path to the JSONL results file
+        """
+        with open(results_file, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json_loads(line)
+                except ValueError:
+                    return
+
+    def _load_jsonl(self, results_file: str) -> Dict[str, Any]:
+        """
+        Load a streamed JSONL results file into the same shape as a JSON results file.
+
+        Args:
+            results_file: Path to the JSONL results file
+
+        Returns:
+            Dictionary with "metadata" and "results" keys
+        """
+        metadata = {}
+        results = []
+        for record in self._iter_jsonl(results_file):
+            if "metadata" in record:
+                # Header line, and the EOF marker carrying the final run metadata
+                metadata.update(record["metadata"])
+            else:
+                results.append(record)
+        return {"metadata": metadata, "results": results}
+
+    def _walk_once(self):
+        """
+        Walk the results once, producing both the per-profile statistics and the
+        mean total score of each profile used by the discrimination analysis.
+        The outcome is cached on the analyzer.
+
+        Returns:
+            Tuple of (aggregated statistics by profile_id, mean total score by profile_id)
         """
+        if self._aggregated is not None:
+            return self._aggregated, self._total_score_means
+
         profile_data = defaultdict(lambda: {
-            "iterations": [],
-            "scores": defaultdict(list),
+            "score_rows": [],
             "description": "",
-            "success_count": 0,
             "error_count": 0
         })
 
@@ -53,15 +147,7 @@ class ATSAnalyzer:
             profile_id = result.get("profile_id")
 
             if result.get("success"):
-                profile_data[profile_id]["success_count"] += 1
-                scores = result.get("scores", {})
-
-                # Collect all scores
-                for score_key, score_value in scores.items():
-                    if isinstance(score_value, (int, float)):
-                        profile_data[profile_id]["scores"][score_key].append(score_value)
-
-                profile_data[profile_id]["iterations"].append(result)
+                profile_data[profile_id]["score_rows"].append(result.get("scores", {}))
             else:
                 profile_data[profile_id]["error_count"] += 1
 
@@ -71,30 +157,56 @@ class ATSAnalyzer:
 
         # Calculate statistics
         aggregated = {}
+        total_score_means = {}
         for profile_id, data in profile_data.items():
+            score_rows = data["score_rows"]
             stats = {
                 "profile_id": profile_id,
                 "description": data["description"],
-                "total_iterations": len(data["iterations"]),
-                "success_count": data["success_count"],
+                "total_iterations": len(score_rows),
+                "success_count": len(score_rows),
                 "error_count": data["error_count"],
                 "scores": {}
             }
 
-            for score_name, score_values in data["scores"].items():
-                if score_values:
-                    stats["scores"][score_name] = {
-                        "mean": statistics.mean(score_values),
-                        "median": statistics.median(score_values),
-                        "stdev": statistics.stdev(score_values) if len(score_values) > 1 else 0,
-                        "min": min(score_values),
-                        "max": max(score_values),
-                        "values": score_values
-                    }
+            # One row per iteration, one column per score key (in first-seen order);
+            # non-numeric values become NaN so every reduction is a single NumPy call
+            score_keys = list(dict.fromkeys(key for row in score_rows for key in row))
+            mat = np.array(
+                [[_score_or_nan(row.get(key)) for key in score_keys] for row in score_rows],
+                dtype=np.float64
+            ).reshape(len(score_rows), len(score_keys))
+
+            has_values = ~np.all(np.isnan(mat), axis=0)
+            score_keys = [key for key, keep in zip(score_keys, has_values) if keep]
+            mat = mat[:, has_values]
+
+            if score_keys:
+                col_stats = column_stats(mat)
+                columns = {name: values.tolist() for name, values in col_stats.items()}
+
+                for j, score_name in enumerate(score_keys):
+                    stats["scores"][score_name] = {name: values[j] for name, values in columns.items()}
+                    if self.keep_values:
+                        column = mat[:, j]
+                        stats["scores"][score_name]["values"] = column[~np.isnan(column)].tolist()
+
+                if "total_score" in stats["scores"]:
+                    total_score_means[profile_id] = stats["scores"]["total_score"]["mean"]
 
             aggregated[profile_id] = stats
 
-        return aggregated
+        self._aggregated, self._total_score_means = aggregated, total_score_means
+        return aggregated, total_score_means
+
+    def aggregate_by_profile(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate results by profile, calculating statistics for each.
+
+        Returns:
+            Dictionary mapping profile_id to aggregated statistics
+        """
+        return self._walk_once()[0]
 
     def detect_discrimination(self, threshold: float = 5.0) -> Dict[str, Any]:
         """
@@ -106,65 +218,72 @@ class ATSAnalyzer:
         Returns:
             Dictionary containing discrimination analysis
         """
-        aggregated = self.aggregate_by_profile()
+        if threshold in self._discrimination:
+            return self._discrimination[threshold]
+
+        aggregated, total_score_means = self._walk_once()
 
         # Get average total scores
-        profile_scores = {}
-        for profile_id, data in aggregated.items():
-            total_score_data = data["scores"].get("total_score")
-            if total_score_data:
-                profile_scores[profile_id] = {
-                    "mean": total_score_data["mean"],
-                    "description": data["description"]
-                }
+        profile_scores = {
+            profile_id: {"mean": mean, "description": aggregated[profile_id]["description"]}
+            for profile_id, mean in total_score_means.items()
+        }
 
         # Find max and min scores
         if not profile_scores:
             return {"error": "No valid scores to analyze"}
 
-        max_profile = max(profile_scores.items(), key=lambda x: x[1]["mean"])
-        min_profile = min(profile_scores.items(), key=lambda x: x[1]["mean"])
+        profile_ids = list(profile_scores)
+        means = np.fromiter((profile_scores[pid]["mean"] for pid in profile_ids), dtype=np.float64, count=len(profile_ids))
+
+        max_idx, min_idx = int(means.argmax()), int(means.argmin())
+        max_profile = (profile_ids[max_idx], profile_scores[profile_ids[max_idx]])
+        min_profile = (profile_ids[min_idx], profile_scores[profile_ids[min_idx]])
 
         score_difference = max_profile[1]["mean"] - min_profile[1]["mean"]
 
-        # Compare all pairs
-        comparisons = []
-        profile_ids = list(profile_scores.keys())
-        for i, profile_a in enumerate(profile_ids):
-            for profile_b in profile_ids[i+1:]:
-                diff = abs(profile_scores[profile_a]["mean"] - profile_scores[profile_b]["mean"])
-                comparisons.append({
-                    "profile_a": profile_a,
-                    "profile_a_desc": profile_scores[profile_a]["description"],
-                    "profile_a_score": round(profile_scores[profile_a]["mean"], 2),
-                    "profile_b": profile_b,
-                    "profile_b_desc": profile_scores[profile_b]["description"],
-                    "profile_b_score": round(profile_scores[profile_b]["mean"], 2),
-                    "difference": round(diff, 2),
-                    "potential_discrimination": diff > threshold
-                })
+        # Compare all pairs: the upper triangle of the pairwise difference matrix
+        # holds every (a, b) pair once, in the same order as a nested loop
+        pair_a, pair_b = np.triu_indices(len(profile_ids), 1)
+        differences = np.abs(means[pair_a] - means[pair_b])
+        flagged = differences > threshold
+
+        comparisons = [
+            {
+                "profile_a": profile_ids[a],
+                "profile_a_desc": profile_scores[profile_ids[a]]["description"],
+                "profile_a_score": profile_scores[profile_ids[a]]["mean"],
+                "profile_b": profile_ids[b],
+                "profile_b_desc": profile_scores[profile_ids[b]]["description"],
+                "profile_b_score": profile_scores[profile_ids[b]]["mean"],
+                "difference": diff,
+                "potential_discrimination": is_flagged
+            }
+            for a, b, diff, is_flagged in zip(pair_a.tolist(), pair_b.tolist(), differences.tolist(), flagged.tolist())
+        ]
 
         # Sort by difference (largest first)
         comparisons.sort(key=lambda x: x["difference"], reverse=True)
 
         discrimination_analysis = {
             "threshold": threshold,
-            "max_difference": round(score_difference, 2),
+            "max_difference": score_difference,
             "highest_scoring_profile": {
                 "profile_id": max_profile[0],
                 "description": max_profile[1]["description"],
-                "mean_score": round(max_profile[1]["mean"], 2)
+                "mean_score": max_profile[1]["mean"]
             },
             "lowest_scoring_profile": {
                 "profile_id": min_profile[0],
                 "description": min_profile[1]["description"],
-                "mean_score": round(min_profile[1]["mean"], 2)
+                "mean_score": min_profile[1]["mean"]
             },
             "potential_discrimination_detected": score_difference > threshold,
             "all_comparisons": comparisons,
             "flagged_comparisons": [c for c in comparisons if c["potential_discrimination"]]
         }
 
+        self._discrimination[threshold] = discrimination_analysis
         return discrimination_analysis
 
     def generate_report(self, output_file: str = None) -> str:
@@ -180,91 +299,93 @@ class ATSAnalyzer:
         aggregated = self.aggregate_by_profile()
         discrimination = self.detect_discrimination()
 
-        report_lines = []
-        report_lines.append("=" * 80)
-        report_lines.append("ATS DISCRIMINATION ANALYSIS REPORT")
-        report_lines.append("=" * 80)
-        report_lines.append("")
+        buf = io.StringIO()
+        write = buf.write
+
+        write(f"{SEP}\n")
+        write("ATS DISCRIMINATION ANALYSIS REPORT\n")
+        write(f"{SEP}\n")
+        write("\n")
 
         # Metadata
-        report_lines.append("EXPERIMENT METADATA")
-        report_lines.append("-" * 80)
+        write("EXPERIMENT METADATA\n")
+        write(f"{SUB}\n")
         for key, value in self.metadata.items():
-            report_lines.append(f"{key}: {value}")
-        report_lines.append("")
+            write(f"{key}: {value}\n")
+        write("\n")
 
         # Profile summaries
-        report_lines.append("PROFILE SCORE SUMMARIES")
-        report_lines.append("-" * 80)
+        write("PROFILE SCORE SUMMARIES\n")
+        write(f"{SUB}\n")
 
-        # Sort by mean total score
-        sorted_profiles = sorted(
-            aggregated.items(),
-            key=lambda x: x[1]["scores"].get("total_score", {}).get("mean", 0),
-            reverse=True
-        )
+        # Sort by mean total score (computed once per profile rather than per comparison)
+        sorted_profiles = [
+            (profile_id, data, data["scores"].get("total_score", {}).get("mean", 0.0))
+            for profile_id, data in aggregated.items()
+        ]
+        sorted_profiles.sort(key=itemgetter(2), reverse=True)
 
-        for profile_id, data in sorted_profiles:
-            report_lines.append(f"\nProfile: {profile_id}")
-            report_lines.append(f"  Description: {data['description']}")
-            report_lines.append(f"  Successful iterations: {data['success_count']}/{data['total_iterations']}")
+        for profile_id, data, _ in sorted_profiles:
+            write(f"\nProfile: {profile_id}\n")
+            write(f"  Description: {data['description']}\n")
+            write(f"  Successful iterations: {data['success_count']}/{data['total_iterations']}\n")
 
             if "total_score" in data["scores"]:
                 ts = data["scores"]["total_score"]
-                report_lines.append(f"  Total Score: {ts['mean']:.2f} ± {ts['stdev']:.2f}")
-                report_lines.append(f"    Min: {ts['min']:.2f}, Max: {ts['max']:.2f}, Median: {ts['median']:.2f}")
+                write(f"  Total Score: {ts['mean']:.2f} ± {ts['stdev']:.2f}\n")
+                write(f"    Min: {ts['min']:.2f}, Max: {ts['max']:.2f}, Median: {ts['median']:.2f}\n")
 
             # Other scores
             for score_name, score_data in data["scores"].items():
                 if score_name != "total_score" and score_name != "match_percentage":
-                    report_lines.append(f"  {score_name}: {score_data['mean']:.2f} ± {score_data['stdev']:.2f}")
+                    write(f"  {score_name}: {score_data['mean']:.2f} ± {score_data['stdev']:.2f}\n")
 
-        report_lines.append("")
+        write("\n")
 
         # Discrimination analysis
-        report_lines.append("DISCRIMINATION ANALYSIS")
-        report_lines.append("-" * 80)
-        report_lines.append(f"Threshold for flagging: {discrimination['threshold']} points")
-        report_lines.append(f"Maximum difference detected: {discrimination['max_difference']} points")
-        report_lines.append("")
-
-        report_lines.append(f"Highest scoring profile:")
-        report_lines.append(f"  {discrimination['highest_scoring_profile']['profile_id']}")
-        report_lines.append(f"  {discrimination['highest_scoring_profile']['description']}")
-        report_lines.append(f"  Mean score: {discrimination['highest_scoring_profile']['mean_score']}")
-        report_lines.append("")
-
-        report_lines.append(f"Lowest scoring profile:")
-        report_lines.append(f"  {discrimination['lowest_scoring_profile']['profile_id']}")
-        report_lines.append(f"  {discrimination['lowest_scoring_profile']['description']}")
-        report_lines.append(f"  Mean score: {discrimination['lowest_scoring_profile']['mean_score']}")
-        report_lines.append("")
+        write("DISCRIMINATION ANALYSIS\n")
+        write(f"{SUB}\n")
+        write(f"Threshold for flagging: {discrimination['threshold']} points\n")
+        write(f"Maximum difference detected: {discrimination['max_difference']:.2f} points\n")
+        write("\n")
+
+        write(f"Highest scoring profile:\n")
+        write(f"  {discrimination['highest_scoring_profile']['profile_id']}\n")
+        write(f"  {discrimination['highest_scoring_profile']['description']}\n")
+        write(f"  Mean score: {discrimination['highest_scoring_profile']['mean_score']:.2f}\n")
+        write("\n")
+
+        write(f"Lowest scoring profile:\n")
+        write(f"  {discrimination['lowest_scoring_profile']['profile_id']}\n")
+        write(f"  {discrimination['lowest_scoring_profile']['description']}\n")
+        write(f"  Mean score: {discrimination['lowest_scoring_profile']['mean_score']:.2f}\n")
+        write("\n")
 
         if discrimination["potential_discrimination_detected"]:
-            report_lines.append("⚠️  POTENTIAL DISCRIMINATION DETECTED")
-            report_lines.append(f"Score difference ({discrimination['max_difference']} points) exceeds threshold ({discrimination['threshold']} points)")
+            write("⚠️  POTENTIAL DISCRIMINATION DETECTED\n")
+            write(f"Score difference ({discrimination['max_difference']:.2f} points) exceeds threshold ({discrimination['threshold']} points)\n")
         else:
-            report_lines.append("✓ No significant discrimination detected")
-        report_lines.append("")
+            write("✓ No significant discrimination detected\n")
+        write("\n")
 
         # Flagged comparisons
         if discrimination["flagged_comparisons"]:
-            report_lines.append("FLAGGED COMPARISONS (exceeding threshold):")
-            report_lines.append("-" * 80)
+            write("FLAGGED COMPARISONS (exceeding threshold):\n")
+            write(f"{SUB}\n")
             for comp in discrimination["flagged_comparisons"]:
-                report_lines.append(f"\n{comp['profile_a']} vs {comp['profile_b']}")
-                report_lines.append(f"  {comp['profile_a_desc']}")
-                report_lines.append(f"  vs")
-                report_lines.append(f"  {comp['profile_b_desc']}")
-                report_lines.append(f"  Score difference: {comp['difference']} points")
-                report_lines.append(f"  ({comp['profile_a_score']} vs {comp['profile_b_score']})")
+                write(f"\n{comp['profile_a']} vs {comp['profile_b']}\n")
+                write(f"  {comp['profile_a_desc']}\n")
+                write(f"  vs\n")
+                write(f"  {comp['profile_b_desc']}\n")
+                write(f"  Score difference: {comp['difference']:.2f} points\n")
+                write(f"  ({comp['profile_a_score']:.2f} vs {comp['profile_b_score']:.2f})\n")
 
-        report_lines.append("")
-        report_lines.append("=" * 80)
-        report_lines.append("END OF REPORT")
-        report_lines.append("=" * 80)
+        write("\n")
+        write(f"{SEP}\n")
+        write("END OF REPORT\n")
+        write(SEP)
 
-        report = "\n".join(report_lines)
+        report = buf.getvalue()
 
         if output_file:
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -293,19 +414,19 @@ class ATSAnalyzer:
             writer.writerow(header)
 
             # Data rows
-            for profile_id, data in aggregated.items():
-                if "total_score" in data["scores"]:
-                    ts = data["scores"]["total_score"]
-                    row = [
-                        profile_id,
-                        data["description"],
-                        data["success_count"],
-                        round(ts["mean"], 2),
-                        round(ts["stdev"], 2),
-                        round(ts["min"], 2),
-                        round(ts["max"], 2)
-                    ]
-                    writer.writerow(row)
+            writer.writerows([
+                [
+                    profile_id,
+                    data["description"],
+                    data["success_count"],
+                    round(ts["mean"], 2),
+                    round(ts["stdev"], 2),
+                    round(ts["min"], 2),
+                    round(ts["max"], 2)
+                ]
+                for profile_id, data in aggregated.items()
+                if (ts := data["scores"].get("total_score")) is not None
+            ])
 
         print(f"CSV summary saved to: {output_file}")
 
@@ -315,7 +436,7 @@ def analyze_results(results_file: str):
     Quick function to analyze results from a file.
 
     Args:
-        results_file: Path to the JSON results file
+        results_file: Path to the JSON, msgpack or JSONL results file
     """
     analyzer = ATSAnalyzer(results_file=results_file)
 
@@ -323,22 +444,75 @@ def analyze_results(results_file: str):
     report = analyzer.generate_report()
     print(report)
 
+    _save_outputs(analyzer, results_file)
+
+    return analyzer
+
+
+def _save_outputs(analyzer: ATSAnalyzer, results_file: str) -> Tuple[str, str]:
+    """
+    Save the report and the CSV summary next to the results file.
+
+    Args:
+        analyzer: Analyzer loaded from results_file
+        results_file: Path of the analyzed results file
+
+    Returns:
+        Tuple of (report path, CSV summary path)
+    """
+    base_file = os.path.splitext(results_file)[0]
+
     # Save report to file
-    report_file = results_file.replace(".json", "_report.txt")
+    report_file = base_file + "_report.txt"
     analyzer.generate_report(output_file=report_file)
 
     # Export CSV
-    csv_file = results_file.replace(".json", "_summary.csv")
+    csv_file = base_file + "_summary.csv"
     analyzer.export_summary_csv(output_file=csv_file)
 
-    return analyzer
+    return report_file, csv_file
+
+
+def _analyze_to_files(results_file: str) -> Tuple[str, str]:
+    """
+    Worker of analyze_results_batch: analyze one file and save its outputs without printing the report.
+    Only the two output paths travel back to the parent process, not the analyzer and its data.
+
+    Args:
+        results_file: Path to the JSON, msgpack or JSONL results file
+
+    Returns:
+        Tuple of (report path, CSV summary path)
+    """
+    return _save_outputs(ATSAnalyzer(results_file=results_file), results_file)
+
+
+def analyze_results_batch(results_files: List[str], workers: int = None) -> List[Tuple[str, str]]:
+    """
+    Analyze several results files in parallel, one worker process per file.
+    Reports are saved to files rather than printed, so concurrent workers do not interleave their output.
+
+    Args:
+        results_files: Paths to the JSON results files
+        workers: Number of worker processes (default: one per CPU core)
+
+    Returns:
+        List of (report path, CSV summary path) tuples, in the same order as results_files
+    """
+    if len(results_files) == 1:
+        return [_analyze_to_files(results_files[0])]
+
+    workers = min(workers or os.cpu_count() or 1, len(results_files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_analyze_to_files, results_files))
 
 
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) > 1:
-        results_file = sys.argv[1]
-        analyze_results(results_file)
+    if len(sys.argv) == 2:
+        analyze_results(sys.argv[1])
+    elif len(sys.argv) > 2:
+        analyze_results_batch(sys.argv[1:])
     else:
-        print("Usage: python analyzer.py <results_file.json>")
+        print("Usage: python analyzer.py <results_file.json> [more_results_files.json ...]")
@@ -3,15 +3,295 @@ Experiment runner to test ATS system for potential discrimination.
 Runs multiple iterations per CV configuration and aggregates results.
 """
 
-import json
+import os
+import gzip
+import base64
+import hashlib
 import time
+import random
 import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from datetime import datetime
+import httpx
 import ollama
 
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+from _cache import ShelveCache, cache_key
 from cv_variations import NAME_VARIATIONS, generate_cv
-from prompt import job_description, prompt_template
+from prompt import is_known_profile, job_description, render_profile_prompt, render_prompt
+from serialization import json_dumps, json_loads, msgpack_dumps
+
+
+def _parse_scores(response_text: str) -> Any:
+    """
+    Parse the JSON scores answered by the model.
+
+    Args:
+        response_text: Raw text answered by the model (a bare JSON object, since calls request format="json")
+
+    Returns:
+        The decoded JSON scores
+
+    Raises:
+        ValueError: If the response is not valid JSON (e.g. an answer cut off by num_predict)
+    """
+    return json_loads(response_text)
+
+
+# Transient failures worth retrying: server errors (model loading, overload), dropped or timed-out
+# connections, and answers that could not be parsed as JSON
+_RETRYABLE_ERRORS = (ollama.ResponseError, ConnectionError, TimeoutError, httpx.TransportError, ValueError)
+
+
+def read_raw_response(result: Dict[str, Any]) -> str:
+    """
+    Return the raw model response stored in a result, whether plain or compressed.
+
+    Args:
+        result: Result dictionary, possibly carrying raw_response or raw_response_gz_b64
+
+    Returns:
+        The raw response text, or None if the result does not keep it
+    """
+    if "raw_response_gz_b64" in result:
+        return gzip.decompress(base64.b64decode(result["raw_response_gz_b64"])).decode("utf-8")
+    return result.get("raw_response")
+
+
+def _with_iso_timestamp(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of a result with its timestamp_ns replaced by an ISO-8601 timestamp.
+
+    Args:
+        result: Result dictionary, possibly carrying a timestamp_ns field
+
+    Returns:
+        The result with a human-readable "timestamp" field
+    """
+    if "timestamp_ns" not in result:
+        return result
+    result = dict(result)
+    result["timestamp"] = datetime.fromtimestamp(result.pop("timestamp_ns") / 1e9).isoformat()
+    return result
+
+
+# Async client shared by every experiment running on the same event loop (see get_shared_async_client)
+_shared_client = None
+_shared_client_loop = None
+
+
+def get_shared_async_client() -> ollama.AsyncClient:
+    """
+    Return the Ollama async client shared by all experiments on the running event loop.
+
+    Experiments awaited one after another inside a single asyncio.run() therefore reuse the same
+    HTTP connection pool. The pool is bound to the loop it was created on, so a new client is made
+    whenever a different loop is running.
+
+    Returns:
+        The shared ollama.AsyncClient
+    """
+    global _shared_client, _shared_client_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client_loop is not loop:
+        _shared_client = ollama.AsyncClient()
+        _shared_client_loop = loop
+    return _shared_client
+
+
+class _LineProgress:
+    """
+    Minimal stand-in for a tqdm bar when tqdm is not installed: prints one short line per
+    completed evaluation instead of redrawing a bar.
+    """
+
+    def __init__(self, total: int, desc: str, disable: bool = False):
+        self.total = total
+        self.desc = desc
+        self.disable = disable
+        self.n = 0
+
+    def update(self, n: int = 1):
+        self.n += n
+        if not self.disable:
+            print(f"  {self.desc}: {self.n}/{self.total} done")
+
+    def write(self, message: str):
+        if not self.disable:
+            print(message)
+
+    def close(self):
+        pass
+
+
+def _progress_bar(total: int, desc: str, verbose: bool):
+    """
+    Create the progress bar of a batch of evaluations.
+
+    Args:
+        total: Number of evaluations in the batch
+        desc: Label shown next to the bar
+        verbose: Whether to show progress at all
+
+    Returns:
+        A tqdm bar if tqdm is installed, otherwise a _LineProgress
+    """
+    if tqdm is not None:
+        return tqdm(total=total, desc=desc, unit="eval", disable=not verbose)
+    return _LineProgress(total, desc, disable=not verbose)
+
+
+def _report(progress, result: Dict[str, Any]):
+    """
+    Count a finished evaluation on a progress bar, printing a line above the bar if it failed.
+
+    Args:
+        progress: Bar returned by _progress_bar
+        result: Result of the evaluation
+    """
+    # tqdm.write is a classmethod that prints even on a disabled bar, so quiet runs are checked here
+    if not result["success"] and not progress.disable:
+        progress.write(f"  ✗ {result['profile_id']} iteration {result.get('iteration', '?')} failed: {result['error']}")
+    progress.update(1)
+
+
+class _EvaluationFailed(Exception):
+    """Raised when an evaluation still fails after its last attempt; wraps the original error."""
+
+    def __init__(self, error: Exception, attempts: int, response_text: str = None):
+        super().__init__(str(error))
+        self.error = error
+        self.attempts = attempts
+        self.response_text = response_text
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests per minute and (estimated) tokens per minute.
+    Both buckets start full, so an initial burst goes through, and refill continuously.
+    """
+
+    def __init__(self, rpm: float = None, tpm: float = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rpm: Maximum requests per minute (None for no request limit)
+            tpm: Maximum tokens per minute (None for no token limit)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = rpm or 0.0
+        self._tokens = tpm or 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._lock_loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        """
+        Return the limiter's lock, recreated if this is a different event loop than the last acquire.
+
+        Returns:
+            Lock serializing waiters on the buckets
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not None and self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+        self._lock_loop = loop
+        return self._lock
+
+    def _refill(self):
+        """Add the tokens earned since the last update, capped at one minute's worth."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens_estimate: int = 0):
+        """
+        Wait until one request and tokens_estimate tokens are available, then consume them.
+
+        Args:
+            tokens_estimate: Estimated prompt + output tokens of the request
+        """
+        # A single request larger than the whole per-minute budget still goes through once the bucket is full
+        tokens_needed = min(tokens_estimate, self.tpm) if self.tpm else 0
+
+        # Waiters queue on the lock, so requests are released in arrival order
+        async with self._get_lock():
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60 / self.rpm)
+                if self.tpm and self._tokens < tokens_needed:
+                    wait = max(wait, (tokens_needed - self._tokens) * 60 / self.tpm)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens_needed
+
+
+class AsyncArtifactWriter:
+    """
+    Appends records to a JSONL checkpoint file from a background thread fed by a queue, so the
+    event loop (or the thread collecting results) never waits on serialization or disk writes.
+    """
+
+    # Queued to tell the writer thread to stop
+    _STOP = object()
+
+    def __init__(self, path: str):
+        """
+        Open the checkpoint file for appending and start the writer thread.
+
+        Args:
+            path: Path of the JSONL file
+        """
+        self.path = path
+        self._fh = open(path, 'ab')
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, record: Dict[str, Any]):
+        """
+        Queue a record to be written as one line; returns immediately.
+
+        Args:
+            record: JSON-serializable record
+        """
+        self._queue.put(record)
+
+    def _run(self):
+        """Write queued records, flushing whenever the queue runs empty, until the stop marker arrives."""
+        while True:
+            record = self._queue.get()
+            if record is self._STOP:
+                break
+            self._fh.write(json_dumps(record) + b"\n")
+            if self._queue.empty():
+                self._fh.flush()
+
+    def flush_and_close(self):
+        """Write every record queued so far, then close the file."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._fh.close()
 
 
 class ATSExperiment:
@@ -20,7 +300,10 @@ class ATSExperiment:
     Tests different CV profiles multiple times to detect bias.
     """
 
-    def __init__(self, model_name: str = "deepseek-r1", iterations_per_config: int = 10, max_concurrent: int = 5, temperature: float = 0.2):
+    def __init__(self, model_name: str = "deepseek-r1", iterations_per_config: int = 10, max_concurrent: int = 5, temperature: float = 0.2,
+                 save_stream: bool = False, keep_raw: bool = False, rpm: float = None, tpm: float = None,
+                 max_attempts: int = 3, reuse_responses: bool = False, max_output_tokens: int = 512, num_ctx: int = 4096,
+                 results_dir: str = "results", compress_raw: bool = False):
         """
         Initialize the experiment runner.
 
@@ -29,140 +312,408 @@ class ATSExperiment:
             iterations_per_config: Number of times to run each CV configuration
             max_concurrent: Maximum number of concurrent API calls (default: 5)
             temperature: Model temperature for consistent grading (default: 0.2)
+            save_stream: Whether to append each result to a JSONL file as soon as it completes, in both the sync
+                         and async runners (default: False)
+            keep_raw: Whether to keep the raw model response for successful evaluations too (default: False,
+                      raw responses are only kept for failures where they are needed for debugging)
+            rpm: Requests per minute allowed by the async runner (default: None, unlimited)
+            tpm: Estimated tokens per minute allowed by the async runner (default: None, unlimited)
+            max_attempts: Attempts per evaluation before recording it as failed (default: 3)
+            reuse_responses: Whether to answer previously made calls from the on-disk response cache, e.g. when
+                             re-running an experiment (default: False). With temperature > 0 the key includes the
+                             iteration number, so iterations still get distinct answers
+            max_output_tokens: Maximum number of tokens the model may generate per answer (default: 512, ample
+                               for the small JSON object requested; raise it for models that reason at length
+                               before answering)
+            num_ctx: Context window in tokens, which must fit the prompt plus the answer (default: 4096)
+            results_dir: Directory for result files, the JSONL stream and the response cache (default: results)
+            compress_raw: Whether to store kept raw responses gzip-compressed and base64-encoded under
+                          raw_response_gz_b64 (default: False); read them back with read_raw_response()
         """
         self.model_name = model_name
         self.iterations_per_config = iterations_per_config
         self.max_concurrent = max_concurrent
         self.temperature = temperature
+        self.keep_raw = keep_raw
+        self.compress_raw = compress_raw
+        self.max_attempts = max_attempts
         self.results = []
 
-    def run_single_evaluation(self, cv_text: str, profile_info: Dict[str, str]) -> Dict[str, Any]:
+        # Created once here, so saving results never has to check for it
+        self.results_dir = results_dir
+        os.makedirs(results_dir, exist_ok=True)
+
+        # Generation options shared by every call. Decoding dominates the cost of an evaluation, so the
+        # answer length is capped; calls also request format="json", so the answer is the JSON object alone
+        self.options = {
+            "temperature": temperature,
+            "num_predict": max_output_tokens,
+            "num_ctx": num_ctx
+        }
+
+        # Responses are only reused when explicitly asked for. The shelve is opened on the first lookup
+        # and closed when a run finishes, so several experiments in one process never hold it at once
+        self.reuse_responses = reuse_responses
+        self._cache = None
+
+        # Caps in-flight async requests across every profile and runner of this experiment. asyncio
+        # primitives bind to the loop they first wait on, so _get_semaphore() swaps it if the loop changes
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._semaphore_loop = None
+
+        # Shapes request throughput on top of the max_concurrent cap; disabled when no limit is given
+        self._limiter = RateLimiter(rpm, tpm) if rpm or tpm else None
+
+        # One sync client for the whole experiment so its HTTP connection pool is reused across calls;
+        # async calls go through the module-wide client from get_shared_async_client()
+        self.client = ollama.Client()
+
+        # Optional JSONL checkpoint: a metadata header line, one line per result, then an EOF marker,
+        # so a crashed run still leaves every completed evaluation on disk
+        self.stream_filename = None
+        self._writer = None
+        if save_stream:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.stream_filename = os.path.join(results_dir, f"ats_experiment_results_{timestamp}.jsonl")
+            self._writer = AsyncArtifactWriter(self.stream_filename)
+            self._stream_write({"metadata": {
+                "start_time": datetime.now().isoformat(),
+                "model_name": self.model_name,
+                "iterations_per_config": self.iterations_per_config,
+                "max_concurrent": self.max_concurrent,
+                "temperature": self.temperature
+            }})
+
+    def _stream_write(self, record: Dict[str, Any]):
         """
-        Run a single CV evaluation using the LLM.
+        Queue a single record for the JSONL stream, if streaming is enabled.
+
+        Args:
+            record: Result (or metadata / EOF marker) to write as one line
+        """
+        if self._writer is not None:
+            self._writer.put(record)
+
+    def close_stream(self, metadata: Dict[str, Any] = None):
+        """
+        Write the EOF marker (with the final run metadata) and close the JSONL stream.
 
         Args:
-            cv_text: The CV text to evaluate
+            metadata: Final experiment metadata to record alongside the EOF marker
+        """
+        if self._writer is not None:
+            self._stream_write({"eof": True, "metadata": metadata or {}})
+            self._writer.flush_and_close()
+            self._writer = None
+            print(f"Streamed results saved to: {self.stream_filename}")
+
+    def _abort_stream(self):
+        """
+        Write out every queued record and close the JSONL stream without an EOF marker, so a run that
+        raised (or was interrupted) still leaves all its completed evaluations on disk.
+        """
+        if self._writer is not None:
+            self._writer.flush_and_close()
+            self._writer = None
+            print(f"Run did not finish; partial results saved to: {self.stream_filename}")
+
+    def _close_cache(self):
+        """Close the response cache, if it is open; the next lookup reopens it."""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def _build_result(self, response_text: str, scores: Any, profile_info: Dict[str, str], iteration: int = None,
+                      attempts: int = 1) -> Dict[str, Any]:
+        """
+        Build the result of a successful evaluation.
+
+        Args:
+            response_text: Raw text answered by the model
+            scores: Scores parsed from the response
             profile_info: Information about the profile being tested
+            iteration: Iteration number for tracking (omitted from the result if None)
+            attempts: Number of model calls it took to get a valid answer (0 if served from the cache)
 
         Returns:
             Dictionary containing the evaluation results
         """
-        prompt = prompt_template.format(cv=cv_text, job_description=job_description)
+        result = {
+            "success": True,
+            "scores": scores,
+            "profile_id": profile_info["id"],
+            "profile_description": profile_info["description"],
+            "timestamp_ns": time.time_ns(),
+            "attempts": attempts
+        }
+        if iteration is not None:
+            result["iteration"] = iteration
+        if self.keep_raw:
+            self._store_raw(result, response_text)
+        return result
+
+    def _build_error(self, failure: _EvaluationFailed, profile_info: Dict[str, str], iteration: int = None) -> Dict[str, Any]:
+        """
+        Build the result of a failed evaluation.
+
+        Args:
+            failure: The failure raised after the last attempt
+            profile_info: Information about the profile being tested
+            iteration: Iteration number for tracking (omitted from the result if None)
 
+        Returns:
+            Dictionary describing the failure
+        """
+        result = {
+            "success": False,
+            "error": str(failure.error),
+            "profile_id": profile_info["id"],
+            "profile_description": profile_info["description"],
+            "timestamp_ns": time.time_ns(),
+            "attempts": failure.attempts
+        }
+        if iteration is not None:
+            result["iteration"] = iteration
+        # Keep whatever the model answered when it could not be parsed
+        if failure.response_text is not None:
+            self._store_raw(result, failure.response_text)
+        return result
+
+    def _store_raw(self, result: Dict[str, Any], response_text: str):
+        """
+        Attach a raw model response to a result, compressed if compress_raw is set.
+
+        Args:
+            result: Result dictionary to update
+            response_text: Raw text answered by the model
+        """
+        if self.compress_raw:
+            result["raw_response_gz_b64"] = base64.b64encode(gzip.compress(response_text.encode("utf-8"))).decode("ascii")
+        else:
+            result["raw_response"] = response_text
+
+    def _cached_response(self, messages: List[Dict[str, str]], iteration: int = None):
+        """
+        Look up a previous answer to the same messages (and, when sampling, the same iteration) in the response cache.
+
+        Args:
+            messages: Chat messages to send
+            iteration: Iteration number of the call
+
+        Returns:
+            Tuple of (cache key, (response text, scores) or None); the key is None when caching is disabled,
+            and an entry whose text no longer parses counts as a miss
+        """
+        if not self.reuse_responses:
+            return None, None
+        if self._cache is None:
+            self._cache = ShelveCache(os.path.join(self.results_dir, ".llm_cache"))
+        # With temperature > 0 every iteration is a distinct sample, so each one gets its own entry
+        # and a re-run replays iteration i's answer; with temperature 0 all iterations share one answer
+        nonce = iteration if self.temperature > 0 else None
+        key = cache_key(self.model_name, self.temperature, "\n".join(m["content"] for m in messages), nonce)
+        response_text = self._cache.get(key)
+        if response_text is None:
+            return key, None
         try:
-            response = ollama.chat(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                options={"temperature": self.temperature}
-            )
-
-            # Extract JSON from response
-            response_text = response['message']['content'].strip()
-
-            # Try to find JSON in the response
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                # Assume the entire response is JSON
-                json_text = response_text
-
-            scores = json.loads(json_text)
-
-            return {
-                "success": True,
-                "scores": scores,
-                "profile_id": profile_info["id"],
-                "profile_description": profile_info["description"],
-                "timestamp": datetime.now().isoformat(),
-                "raw_response": response_text
-            }
+            return key, (response_text, _parse_scores(response_text))
+        except ValueError:
+            # E.g. a fenced answer cached before responses were constrained to JSON; the model is asked
+            # again and its answer replaces the stale entry
+            return key, None
 
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "profile_id": profile_info["id"],
-                "profile_description": profile_info["description"],
-                "timestamp": datetime.now().isoformat()
-            }
+    def _backoff_delay(self, attempt: int, base: float) -> float:
+        """Exponential backoff with a little jitter so concurrent retries do not fire in lockstep."""
+        return base * 2 ** (attempt - 1) + random.random() * 0.2
 
-    async def run_single_evaluation_async(self, cv_text: str, profile_info: Dict[str, str], iteration: int = 1) -> Dict[str, Any]:
+    def _accept_response(self, key: str, response_text: str) -> Any:
         """
-        Run a single CV evaluation using the LLM asynchronously.
+        Parse the scores of a model answer and, if they parsed, store the answer in the response cache.
+
+        Args:
+            key: Cache key of the call (None when caching is disabled)
+            response_text: Stripped text answered by the model
+
+        Returns:
+            Scores parsed from the response
+
+        Raises:
+            ValueError: If the response is not valid JSON
+        """
+        scores = _parse_scores(response_text)
+        # Only answers that parsed are worth reusing
+        if key is not None:
+            self._cache.set(key, response_text)
+        return scores
+
+    def _retry_or_raise(self, error: Exception, attempt: int, attempts: int, response_text: str = None):
+        """
+        Decide what to do after a failed attempt: return to retry it, or raise if it was the last one
+        or the error is not transient.
+
+        Args:
+            error: Error raised by the attempt
+            attempt: Number of the failed attempt
+            attempts: Maximum number of attempts
+            response_text: Text answered by the model, if the failure came after the call
+
+        Raises:
+            _EvaluationFailed: If the evaluation should not be retried
+        """
+        if not isinstance(error, _RETRYABLE_ERRORS) or attempt == attempts:
+            raise _EvaluationFailed(error, attempt, response_text) from error
+
+    def _call_with_retry_sync(self, messages: List[Dict[str, str]], *, iteration: int = None, attempts: int = None,
+                              base: float = 0.5):
+        """
+        Call the model and parse its scores, retrying transient failures with exponential backoff.
 
         Args:
-            cv_text: The CV text to evaluate
+            messages: Chat messages to send
+            iteration: Iteration number of the call, part of the cache key when sampling with temperature > 0
+            attempts: Maximum number of attempts (defaults to self.max_attempts)
+            base: Delay in seconds before the first retry, doubled on each further retry
+
+        Returns:
+            Tuple of (response_text, scores, attempts used); attempts is 0 for an answer served from the cache
+
+        Raises:
+            _EvaluationFailed: If the last attempt fails or a non-retryable error occurs
+        """
+        key, cached = self._cached_response(messages, iteration)
+        if cached is not None:
+            return cached[0], cached[1], 0
+
+        attempts = attempts or self.max_attempts
+        for attempt in range(1, attempts + 1):
+            response_text = None
+            try:
+                response = self.client.chat(
+                    model=self.model_name,
+                    messages=messages,
+                    format="json",
+                    options=self.options
+                )
+                response_text = response['message']['content'].strip()
+                return response_text, self._accept_response(key, response_text), attempt
+            except Exception as e:
+                self._retry_or_raise(e, attempt, attempts, response_text)
+            time.sleep(self._backoff_delay(attempt, base))
+
+    async def _call_with_retry(self, messages: List[Dict[str, str]], *, iteration: int = None, attempts: int = None,
+                               base: float = 0.5):
+        """
+        Async variant of _call_with_retry_sync using the async client and asyncio.sleep.
+
+        Args:
+            messages: Chat messages to send
+            iteration: Iteration number of the call, part of the cache key when sampling with temperature > 0
+            attempts: Maximum number of attempts (defaults to self.max_attempts)
+            base: Delay in seconds before the first retry, doubled on each further retry
+
+        Returns:
+            Tuple of (response_text, scores, attempts used); attempts is 0 for an answer served from the cache
+
+        Raises:
+            _EvaluationFailed: If the last attempt fails or a non-retryable error occurs
+        """
+        key, cached = self._cached_response(messages, iteration)
+        if cached is not None:
+            return cached[0], cached[1], 0
+
+        attempts = attempts or self.max_attempts
+        for attempt in range(1, attempts + 1):
+            response_text = None
+            try:
+                response = await get_shared_async_client().chat(
+                    model=self.model_name,
+                    messages=messages,
+                    format="json",
+                    options=self.options
+                )
+                response_text = response['message']['content'].strip()
+                return response_text, self._accept_response(key, response_text), attempt
+            except Exception as e:
+                self._retry_or_raise(e, attempt, attempts, response_text)
+            await asyncio.sleep(self._backoff_delay(attempt, base))
+
+    def run_single_evaluation(self, prompt: str, profile_info: Dict[str, str], iteration: int = None) -> Dict[str, Any]:
+        """
+        Run a single CV evaluation using the LLM.
+
+        Args:
+            prompt: The fully formatted evaluation prompt (CV + job description)
             profile_info: Information about the profile being tested
             iteration: Iteration number for tracking
 
         Returns:
             Dictionary containing the evaluation results
         """
-        prompt = prompt_template.format(cv=cv_text, job_description=job_description)
+        try:
+            response_text, scores, attempts = self._call_with_retry_sync([{"role": "user", "content": prompt}], iteration=iteration)
+            return self._build_result(response_text, scores, profile_info, iteration, attempts)
+        except _EvaluationFailed as e:
+            return self._build_error(e, profile_info, iteration)
 
+    async def run_single_evaluation_async(self, prompt: str, profile_info: Dict[str, str], iteration: int = 1) -> Dict[str, Any]:
+        """
+        Run a single CV evaluation using the LLM asynchronously.
+
+        Args:
+            prompt: The fully formatted evaluation prompt (CV + job description)
+            profile_info: Information about the profile being tested
+            iteration: Iteration number for tracking
+
+        Returns:
+            Dictionary containing the evaluation results
+        """
         try:
-            # Run the blocking API call in a thread pool
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: ollama.chat(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    options={"temperature": self.temperature}
-                )
-            )
-
-            # Extract JSON from response
-            response_text = response['message']['content'].strip()
-
-            # Try to find JSON in the response
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                # Assume the entire response is JSON
-                json_text = response_text
-
-            scores = json.loads(json_text)
-
-            return {
-                "success": True,
-                "scores": scores,
-                "profile_id": profile_info["id"],
-                "profile_description": profile_info["description"],
-                "timestamp": datetime.now().isoformat(),
-                "iteration": iteration,
-                "raw_response": response_text
-            }
+            response_text, scores, attempts = await self._call_with_retry([{"role": "user", "content": prompt}], iteration=iteration)
+            return self._build_result(response_text, scores, profile_info, iteration, attempts)
+        except _EvaluationFailed as e:
+            return self._build_error(e, profile_info, iteration)
 
-        except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "profile_id": profile_info["id"],
-                "profile_description": profile_info["description"],
-                "timestamp": datetime.now().isoformat(),
-                "iteration": iteration
-            }
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Return the experiment's semaphore, recreated if this is a different event loop than the last async run.
+
+        Returns:
+            Semaphore allowing max_concurrent in-flight requests
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not None and self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._semaphore_loop = loop
+        return self._semaphore
+
+    def _prepare_prompts(self, profiles: List[Dict[str, str]]) -> Dict[str, tuple]:
+        """
+        Generate each profile's CV and render its evaluation prompt, once, before any model call.
+
+        Args:
+            profiles: Profiles to test
+
+        Returns:
+            Dictionary mapping profile_id to a (profile, prompt) tuple
+        """
+        prepared = {}
+        for profile in profiles:
+            if is_known_profile(profile):
+                # Memoized in prompt.py, so later experiments in the same process reuse the string
+                prompt = render_profile_prompt(profile["id"])
+            else:
+                prompt = render_prompt(generate_cv(profile), job_description)
+            prepared[profile["id"]] = (profile, prompt)
+        return prepared
 
-    def run_profile_experiment(self, profile: Dict[str, str], verbose: bool = True) -> List[Dict[str, Any]]:
+    def run_profile_experiment(self, profile: Dict[str, str], verbose: bool = True, prompt: str = None) -> List[Dict[str, Any]]:
         """
-        Run multiple evaluations for a single profile.
+        Run multiple evaluations for a single profile using a thread pool.
 
         Args:
             profile: Profile configuration to test
             verbose: Whether to print progress
+            prompt: Prebuilt evaluation prompt for the profile (rendered here if None)
 
         Returns:
             List of results for all iterations
@@ -171,39 +722,39 @@ class ATSExperiment:
             print(f"\n{'='*70}")
             print(f"Testing Profile: {profile['name']}")
             print(f"Description: {profile['description']}")
-            print(f"Running {self.iterations_per_config} iterations...")
+            print(f"Running {self.iterations_per_config} iterations (max {self.max_concurrent} at a time)...")
             print(f"{'='*70}")
 
-        cv_text = generate_cv(profile)
-        profile_results = []
-
-        for iteration in range(self.iterations_per_config):
-            if verbose:
-                print(f"  Iteration {iteration + 1}/{self.iterations_per_config}...", end=" ")
-
-            result = self.run_single_evaluation(cv_text, profile)
-            result["iteration"] = iteration + 1
-            profile_results.append(result)
+        # The prompt is identical for every iteration of a profile, so build it once
+        if prompt is None:
+            _, prompt = self._prepare_prompts([profile])[profile["id"]]
 
-            if verbose:
-                if result["success"]:
-                    total_score = result["scores"].get("total_score", "N/A")
-                    print(f"✓ Score: {total_score}")
-                else:
-                    print(f"✗ Error: {result['error']}")
+        def evaluation(iteration):
+            return self.run_single_evaluation(prompt, profile, iteration + 1)
 
-            # Small delay to avoid rate limiting
-            # time.sleep(0.5)
+        # The Ollama call is I/O-bound, so a thread pool keeps up to max_concurrent
+        # requests in flight; map() preserves iteration order in the results.
+        # Progress is reported from this thread only, so workers never contend for stdout
+        profile_results = []
+        progress = _progress_bar(self.iterations_per_config, profile["name"], verbose)
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            for result in executor.map(evaluation, range(self.iterations_per_config)):
+                self._stream_write(result)
+                _report(progress, result)
+                profile_results.append(result)
+        progress.close()
 
         return profile_results
 
-    async def run_profile_experiment_async(self, profile: Dict[str, str], verbose: bool = True) -> List[Dict[str, Any]]:
+    async def run_profile_experiment_async(self, profile: Dict[str, str], verbose: bool = True,
+                                           prompt: str = None) -> List[Dict[str, Any]]:
         """
         Run multiple evaluations for a single profile concurrently.
 
         Args:
             profile: Profile configuration to test
             verbose: Whether to print progress
+            prompt: Prebuilt evaluation prompt for the profile (rendered here if None)
 
         Returns:
             List of results for all iterations
@@ -215,29 +766,75 @@ class ATSExperiment:
             print(f"Running {self.iterations_per_config} iterations concurrently (max {self.max_concurrent} at a time)...")
             print(f"{'='*70}")
 
-        cv_text = generate_cv(profile)
-        
-        # Create semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(self.max_concurrent)
-        
-        async def bounded_evaluation(iteration):
-            async with semaphore:
-                if verbose:
-                    print(f"  Starting iteration {iteration + 1}/{self.iterations_per_config}...")
-                result = await self.run_single_evaluation_async(cv_text, profile, iteration + 1)
-                if verbose:
-                    if result["success"]:
-                        total_score = result["scores"].get("total_score", "N/A")
-                        print(f"  ✓ Iteration {iteration + 1} completed: Score {total_score}")
-                    else:
-                        print(f"  ✗ Iteration {iteration + 1} failed: {result['error']}")
-                return result
-        
+        # The prompt is identical for every iteration of a profile, so build it once
+        if prompt is None:
+            _, prompt = self._prepare_prompts([profile])[profile["id"]]
+
+        # Limit concurrent requests with the experiment-wide semaphore
+        semaphore = self._get_semaphore()
+
         # Run all iterations concurrently (with semaphore limiting parallelism)
-        tasks = [bounded_evaluation(i) for i in range(self.iterations_per_config)]
-        profile_results = await asyncio.gather(*tasks)
-        
-        return list(profile_results)
+        progress = _progress_bar(self.iterations_per_config, profile["name"], verbose)
+        tasks = [self._bounded_evaluation(semaphore, [profile], prompt, i) for i in range(self.iterations_per_config)]
+        profile_results = await self._collect(tasks, progress)
+        progress.close()
+
+        return profile_results
+
+    async def _bounded_evaluation(self, semaphore: asyncio.Semaphore, profiles: List[Dict[str, str]], prompt: str,
+                                  iteration: int) -> List[Dict[str, Any]]:
+        """
+        Run one evaluation once a slot on the semaphore is free, on behalf of every profile sharing the prompt.
+
+        Args:
+            semaphore: Semaphore limiting the number of in-flight requests
+            profiles: Profiles whose rendered prompt is exactly prompt (usually just one)
+            prompt: The fully formatted evaluation prompt
+            iteration: Zero-based iteration index
+
+        Returns:
+            One result per profile, all carrying the same model answer
+        """
+        async with semaphore:
+            if self._limiter is not None:
+                # ~4 characters per prompt token, plus the answer's token cap
+                await self._limiter.acquire(len(prompt) // 4 + self.options["num_predict"])
+            result = await self.run_single_evaluation_async(prompt, profiles[0], iteration + 1)
+
+        return [result] + [
+            dict(result, profile_id=profile["id"], profile_description=profile["description"])
+            for profile in profiles[1:]
+        ]
+
+    async def _collect(self, tasks: List, progress, dispatch_order: List[int] = None) -> List[Dict[str, Any]]:
+        """
+        Await evaluations in completion order, streaming and reporting each result as soon as it finishes.
+
+        Args:
+            tasks: Evaluation coroutines (from _bounded_evaluation), each returning a list of results
+            progress: Progress bar (from _progress_bar) updated for every finished result
+            dispatch_order: Indices of tasks in the order they should start (default: the order of tasks)
+
+        Returns:
+            The results, flattened in the same order as tasks whatever the dispatch order
+        """
+        async def indexed(index, task):
+            return index, await task
+
+        # Started explicitly, in order: as_completed would schedule bare coroutines from a set, in arbitrary
+        # order, and the semaphore admits tasks in the order they start waiting on it
+        order = dispatch_order if dispatch_order is not None else range(len(tasks))
+        started = [asyncio.ensure_future(indexed(i, tasks[i])) for i in order]
+
+        batches = [None] * len(tasks)
+        for next_done in asyncio.as_completed(started):
+            index, batch = await next_done
+            for result in batch:
+                # Only queued here; the writer thread serializes and writes it
+                self._stream_write(result)
+                _report(progress, result)
+            batches[index] = batch
+        return [result for batch in batches for result in batch]
 
     def run_all_experiments(self, profiles: List[Dict[str, str]] = None, verbose: bool = True) -> Dict[str, Any]:
         """
@@ -266,9 +863,16 @@ class ATSExperiment:
 
         all_results = []
 
-        for profile in profiles:
-            profile_results = self.run_profile_experiment(profile, verbose=verbose)
-            all_results.extend(profile_results)
+        try:
+            for profile, prompt in self._prepare_prompts(profiles).values():
+                profile_results = self.run_profile_experiment(profile, verbose=verbose, prompt=prompt)
+                all_results.extend(profile_results)
+        except BaseException:
+            # Including KeyboardInterrupt: the writer thread is a daemon, so its queue must be drained here
+            self._abort_stream()
+            raise
+        finally:
+            self._close_cache()
 
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -280,12 +884,15 @@ class ATSExperiment:
                 "duration_seconds": duration,
                 "model_name": self.model_name,
                 "iterations_per_config": self.iterations_per_config,
+                "max_concurrent": self.max_concurrent,
                 "total_profiles": len(profiles),
                 "total_evaluations": len(all_results)
             },
             "results": all_results
         }
 
+        self.close_stream(experiment_data["metadata"])
+
         if verbose:
             print(f"\n{'#'*70}")
             print(f"# Experiment completed in {duration:.2f} seconds")
@@ -319,12 +926,44 @@ class ATSExperiment:
             print(f"# Max concurrent requests: {self.max_concurrent}")
             print(f"{'#'*70}")
 
-        all_results = []
-
-        # Run profiles sequentially (but iterations within each profile are concurrent)
-        for profile in profiles:
-            profile_results = await self.run_profile_experiment_async(profile, verbose=verbose)
-            all_results.extend(profile_results)
+        # One semaphore shared by every (profile, iteration) task, so the Ollama server is kept
+        # busy across profile boundaries instead of draining at the end of each profile
+        semaphore = self._get_semaphore()
+
+        # CV and prompt generation happens up front, outside the concurrent section (and outside retries)
+        prepared = self._prepare_prompts(profiles)
+
+        # Profiles whose rendered prompts are byte-identical share their model calls: each iteration is
+        # sent once and its result copied to every profile of the group. Iterations stay separate calls,
+        # so every profile still gets iterations_per_config distinct samples
+        groups = {}
+        for profile, prompt in prepared.values():
+            digest = hashlib.blake2b(prompt.encode("utf-8")).digest()
+            groups.setdefault(digest, (prompt, []))[1].append(profile)
+
+        # Profiles run interleaved, so a single bar tracks the whole experiment
+        progress = _progress_bar(len(prepared) * self.iterations_per_config, "Evaluations", verbose)
+        task_args = [
+            (group_profiles, prompt, i)
+            for prompt, group_profiles in groups.values()
+            for i in range(self.iterations_per_config)
+        ]
+        tasks = [self._bounded_evaluation(semaphore, *args) for args in task_args]
+
+        # Longest prompts start first (prompt length is a proxy for evaluation time), so the slowest
+        # evaluations do not straggle at the end while the other slots sit idle. Only the dispatch
+        # order changes: results still come back in the order of profiles
+        dispatch_order = sorted(range(len(task_args)), key=lambda t: len(task_args[t][1]), reverse=True)
+        try:
+            all_results = await self._collect(tasks, progress, dispatch_order)
+        except BaseException:
+            # Including KeyboardInterrupt and cancellation: the writer thread is a daemon, so its queue
+            # must be drained here
+            self._abort_stream()
+            raise
+        finally:
+            self._close_cache()
+        progress.close()
 
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -344,6 +983,8 @@ class ATSExperiment:
             "results": all_results
         }
 
+        self.close_stream(experiment_data["metadata"])
+
         if verbose:
             print(f"\n{'#'*70}")
             print(f"# Experiment completed in {duration:.2f} seconds")
@@ -352,29 +993,70 @@ class ATSExperiment:
 
         return experiment_data
 
-    def save_results(self, experiment_data: Dict[str, Any], filename: str = None):
+    def save_results(self, experiment_data: Dict[str, Any], filename: str = None, indent: bool = False,
+                     format: str = "json"):
         """
-        Save experiment results to a JSON file.
+        Save experiment results to a JSON or msgpack file.
 
         Args:
             experiment_data: Complete experiment data to save
-            filename: Output filename (auto-generated if None)
+            filename: Output filename (auto-generated in results_dir if None)
+            indent: Whether to pretty-print the JSON (default: False, compact output is much smaller and faster to write)
+            format: "json" (default) or "msgpack"; msgpack files are smaller and faster to write and read back,
+                    and are saved with a small JSON manifest of the run metadata for human inspection
+
+        Returns:
+            Path of the saved results file
         """
+        if format not in ("json", "msgpack"):
+            raise ValueError(f"Unknown results format: {format}")
+
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"results/ats_experiment_results_{timestamp}.json"
+            filename = os.path.join(self.results_dir, f"ats_experiment_results_{timestamp}.{format}")
+        elif os.path.dirname(filename):
+            # A caller-chosen path may point outside results_dir
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-        # Create results directory if it doesn't exist
-        import os
-        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
+        # Results carry a raw nanosecond timestamp; format it as ISO once, only for the saved file
+        experiment_data = {
+            **experiment_data,
+            "results": [_with_iso_timestamp(result) for result in experiment_data.get("results", [])]
+        }
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(experiment_data, f, indent=2, ensure_ascii=False)
+        if format == "msgpack":
+            with open(filename, 'wb') as f:
+                f.write(msgpack_dumps(experiment_data))
+            manifest = {
+                "results_file": os.path.basename(filename),
+                "format": "msgpack",
+                "metadata": experiment_data.get("metadata", {})
+            }
+            with open(os.path.splitext(filename)[0] + "_manifest.json", 'wb') as f:
+                f.write(json_dumps(manifest, indent=True) + b"\n")
+        else:
+            with open(filename, 'wb') as f:
+                f.write(json_dumps(experiment_data, indent=indent) + b"\n")
 
         print(f"Results saved to: {filename}")
         return filename
 
 
+async def quick_test_async(iterations: int = 3, num_profiles: int = 2, max_concurrent: int = 5):
+    """
+    Run a quick async test on the current event loop, so several tests can share one loop and client.
+
+    Args:
+        iterations: Number of iterations per profile
+        num_profiles: Number of profiles to test
+        max_concurrent: Maximum concurrent requests (default: 5)
+    """
+    experiment = ATSExperiment(iterations_per_config=iterations, max_concurrent=max_concurrent)
+    results = await experiment.run_all_experiments_async(profiles=NAME_VARIATIONS[:num_profiles])
+    filename = experiment.save_results(results)
+    return results, filename
+
+
 def quick_test(iterations: int = 3, num_profiles: int = 2, async_mode: bool = True, max_concurrent: int = 5):
     """
     Run a quick test with fewer iterations and profiles.
@@ -385,14 +1067,13 @@ def quick_test(iterations: int = 3, num_profiles: int = 2, async_mode: bool = Tr
         async_mode: Whether to use async/concurrent execution (default: True)
         max_concurrent: Maximum concurrent requests when in async mode (default: 5)
     """
-    experiment = ATSExperiment(iterations_per_config=iterations, max_concurrent=max_concurrent)
-    profiles_to_test = NAME_VARIATIONS[:num_profiles]
-    
     if async_mode:
-        results = asyncio.run(experiment.run_all_experiments_async(profiles=profiles_to_test))
-    else:
-        results = experiment.run_all_experiments(profiles=profiles_to_test)
-    
+        # Starts (and closes) its own event loop; call quick_test_async from a running loop to run many tests.
+        # The loop is whatever the current event loop policy provides (main.py installs uvloop's)
+        return asyncio.run(quick_test_async(iterations, num_profiles, max_concurrent))
+
+    experiment = ATSExperiment(iterations_per_config=iterations, max_concurrent=max_concurrent)
+    results = experiment.run_all_experiments(profiles=NAME_VARIATIONS[:num_profiles])
     filename = experiment.save_results(results)
     return results, filename
 
@@ -4,12 +4,47 @@ Run experiments to test if the ATS system shows bias based on CV demographics.
 """
 
 import asyncio
-from experiment_runner import ATSExperiment, quick_test
-from analyzer import ATSAnalyzer
-from cv_variations import NAME_VARIATIONS
+import os
 
+# Every experiment started from this entry point runs on uvloop's libuv-based event loop when it is
+# installed (not available on Windows), and on the stdlib loop otherwise. This is the only place the
+# policy is set: the library modules leave it to their callers, so importing them changes nothing
+try:
+    import uvloop
+except ImportError:
+    pass
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-def run_full_experiment(iterations_per_profile: int = 10, save_results: bool = True, max_concurrent: int = 5):
+# The experiment, analysis and profile modules (and their heavy dependencies: numpy, numba, the
+# Ollama client) are imported inside the functions that use them, so each command only pays for
+# what it runs
+
+
+def clamp_to_server_parallel(max_concurrent: int) -> int:
+    """
+    Limit the number of concurrent requests to what the Ollama server processes in parallel.
+    Requests above that limit only queue on the server, so they add load without adding throughput.
+
+    Args:
+        max_concurrent: Requested maximum number of concurrent requests
+
+    Returns:
+        max_concurrent, lowered to OLLAMA_NUM_PARALLEL when that environment variable is set and smaller
+    """
+    try:
+        server_parallel = int(os.environ.get("OLLAMA_NUM_PARALLEL", ""))
+    except ValueError:
+        # Unset (or not a number): the server picks its own limit, so keep the requested value
+        return max_concurrent
+
+    if 0 < server_parallel < max_concurrent:
+        print(f"⚠️  Limiting concurrent requests to {server_parallel} (OLLAMA_NUM_PARALLEL)")
+        return server_parallel
+    return max_concurrent
+
+
+async def run_full_experiment_async(iterations_per_profile: int = 10, save_results: bool = True, max_concurrent: int = 5):
     """
     Run a full experiment testing all CV profiles using async execution.
 
@@ -21,6 +56,11 @@ def run_full_experiment(iterations_per_profile: int = 10, save_results: bool = T
     Returns:
         Tuple of (experiment_data, analyzer, results_filename)
     """
+    from experiment_runner import ATSExperiment
+    from analyzer import ATSAnalyzer
+    from cv_variations import NAME_VARIATIONS
+    max_concurrent = clamp_to_server_parallel(max_concurrent)
+
     print(f"\n🔬 Starting ATS Discrimination Testing System (ASYNC MODE)")
     print(f"📊 Configuration:")
     print(f"   - Profiles to test: {len(NAME_VARIATIONS)}")
@@ -30,8 +70,10 @@ def run_full_experiment(iterations_per_profile: int = 10, save_results: bool = T
     print()
 
     # Create and run experiment asynchronously
-    experiment = ATSExperiment(iterations_per_config=iterations_per_profile, max_concurrent=max_concurrent)
-    experiment_data = asyncio.run(experiment.run_all_experiments_async())
+    # Long runs checkpoint every result to a JSONL file, so a crash does not lose the completed evaluations
+    experiment = ATSExperiment(iterations_per_config=iterations_per_profile, max_concurrent=max_concurrent,
+                               save_stream=save_results)
+    experiment_data = await experiment.run_all_experiments_async()
 
     # Save results
     results_filename = None
@@ -47,29 +89,35 @@ def run_full_experiment(iterations_per_profile: int = 10, save_results: bool = T
     print("\n" + report)
 
     if save_results:
-        report_filename = results_filename.replace(".json", "_report.txt")
+        base_filename = os.path.splitext(results_filename)[0]
+        report_filename = base_filename + "_report.txt"
         analyzer.generate_report(output_file=report_filename)
 
-        csv_filename = results_filename.replace(".json", "_summary.csv")
+        csv_filename = base_filename + "_summary.csv"
         analyzer.export_summary_csv(output_file=csv_filename)
 
     return experiment_data, analyzer, results_filename
 
 
-def run_quick_test(iterations: int = 3, num_profiles: int = 2):
+async def run_quick_test_async(iterations: int = 3, num_profiles: int = 2, max_concurrent: int = 5):
     """
     Run a quick test with limited profiles and iterations.
 
     Args:
         iterations: Number of iterations per profile
         num_profiles: Number of profiles to test
+        max_concurrent: Maximum number of concurrent requests (default: 5)
     """
+    from experiment_runner import quick_test_async
+    from analyzer import ATSAnalyzer
+    max_concurrent = clamp_to_server_parallel(max_concurrent)
+
     print(f"\n🧪 Running Quick Test")
     print(f"   - Testing {num_profiles} profiles")
     print(f"   - {iterations} iterations each")
     print()
 
-    results, filename = quick_test(iterations=iterations, num_profiles=num_profiles)
+    results, filename = await quick_test_async(iterations=iterations, num_profiles=num_profiles, max_concurrent=max_concurrent)
 
     # Analyze
     print("\n📈 Analyzing results...")
@@ -80,7 +128,7 @@ def run_quick_test(iterations: int = 3, num_profiles: int = 2):
     return results, analyzer, filename
 
 
-def run_custom_experiment(profile_ids: list, iterations: int = 10, max_concurrent: int = 5):
+async def run_custom_experiment_async(profile_ids: list, iterations: int = 10, max_concurrent: int = 5):
     """
     Run experiment with specific profiles only using async execution.
 
@@ -89,6 +137,9 @@ def run_custom_experiment(profile_ids: list, iterations: int = 10, max_concurren
         iterations: Number of iterations per profile
         max_concurrent: Maximum number of concurrent requests (default: 5)
     """
+    from experiment_runner import ATSExperiment
+    from analyzer import ATSAnalyzer
+    from cv_variations import NAME_VARIATIONS
     # Filter profiles
     selected_profiles = [p for p in NAME_VARIATIONS if p["id"] in profile_ids]
 
@@ -96,6 +147,8 @@ def run_custom_experiment(profile_ids: list, iterations: int = 10, max_concurren
         print(f"❌ No profiles found matching IDs: {profile_ids}")
         return None
 
+    max_concurrent = clamp_to_server_parallel(max_concurrent)
+
     print(f"\n🔬 Running Custom Experiment (ASYNC MODE)")
     print(f"   - Selected profiles: {[p['id'] for p in selected_profiles]}")
     print(f"   - Iterations per profile: {iterations}")
@@ -103,7 +156,7 @@ def run_custom_experiment(profile_ids: list, iterations: int = 10, max_concurren
     print()
 
     experiment = ATSExperiment(iterations_per_config=iterations, max_concurrent=max_concurrent)
-    experiment_data = asyncio.run(experiment.run_all_experiments_async(profiles=selected_profiles))
+    experiment_data = await experiment.run_all_experiments_async(profiles=selected_profiles)
 
     results_filename = experiment.save_results(experiment_data)
 
@@ -112,12 +165,31 @@ def run_custom_experiment(profile_ids: list, iterations: int = 10, max_concurren
     report = analyzer.generate_report()
     print("\n" + report)
 
-    report_filename = results_filename.replace(".json", "_report.txt")
+    report_filename = os.path.splitext(results_filename)[0] + "_report.txt"
     analyzer.generate_report(output_file=report_filename)
 
     return experiment_data, analyzer, results_filename
 
 
+# Synchronous entry points: each starts and closes one event loop. To run several experiments
+# (e.g. a parameter sweep), await the *_async variants inside a single asyncio.run() instead, so
+# they share the event loop and the Ollama async client's connection pool.
+
+def run_full_experiment(iterations_per_profile: int = 10, save_results: bool = True, max_concurrent: int = 5):
+    """Run run_full_experiment_async in a new event loop."""
+    return asyncio.run(run_full_experiment_async(iterations_per_profile, save_results, max_concurrent))
+
+
+def run_quick_test(iterations: int = 3, num_profiles: int = 2, max_concurrent: int = 5):
+    """Run run_quick_test_async in a new event loop."""
+    return asyncio.run(run_quick_test_async(iterations, num_profiles, max_concurrent))
+
+
+def run_custom_experiment(profile_ids: list, iterations: int = 10, max_concurrent: int = 5):
+    """Run run_custom_experiment_async in a new event loop."""
+    return asyncio.run(run_custom_experiment_async(profile_ids, iterations, max_concurrent))
+
+
 if __name__ == "__main__":
     import sys
 
@@ -136,24 +208,29 @@ if __name__ == "__main__":
 
         elif command == "custom":
             # Custom profiles
-            if len(sys.argv) < 3:
-                print("Usage: python main.py custom <profile_ids...> [iterations]")
-                print("Example: python main.py custom profile_1 profile_2 profile_3 5")
-                sys.exit(1)
-
-            # Get profile IDs and iterations
-            profile_ids = []
-            iterations = 10
-            for arg in sys.argv[2:]:
-                if arg.startswith("profile_"):
-                    profile_ids.append(arg)
-                else:
-                    try:
-                        iterations = int(arg)
-                    except ValueError:
-                        pass
-
-            run_custom_experiment(profile_ids=profile_ids, iterations=iterations)
+            import argparse
+
+            parser = argparse.ArgumentParser(
+                prog="python main.py custom",
+                description="Run the experiment on selected profiles only.",
+                epilog="Example: python main.py custom profile_1 profile_2 profile_3 --iterations 5"
+            )
+            parser.add_argument("profile_ids", nargs="+", help="IDs of the profiles to test (e.g. profile_1)")
+            parser.add_argument("-n", "--iterations", type=int, default=10, help="Iterations per profile (default: 10)")
+            args = parser.parse_args(sys.argv[2:])
+
+            from cv_variations import NAME_VARIATIONS
+            known_ids = {p["id"] for p in NAME_VARIATIONS}
+            unknown_ids = [pid for pid in args.profile_ids if pid not in known_ids]
+            if unknown_ids and args.profile_ids[-1].isdigit():
+                # The iteration count used to be a bare trailing argument
+                parser.error(f"'{args.profile_ids[-1]}' is not a profile ID; "
+                             f"pass the iteration count as --iterations {args.profile_ids[-1]}")
+            if unknown_ids:
+                parser.error(f"unknown profile IDs: {', '.join(unknown_ids)} "
+                             f"(available: {', '.join(p['id'] for p in NAME_VARIATIONS)})")
+
+            run_custom_experiment(profile_ids=args.profile_ids, iterations=args.iterations)
 
         elif command == "analyze":
             # Analyze existing results
@@ -168,7 +245,7 @@ if __name__ == "__main__":
             print("Unknown command. Available commands:")
             print("  python main.py quick              - Quick test (3 iterations, 2 profiles)")
             print("  python main.py full [iterations]  - Full experiment (default: 10 iterations)")
-            print("  python main.py custom <profile_ids...> [iterations]")
+            print("  python main.py custom <profile_ids...> [--iterations N]")
             print("  python main.py analyze <file.json> - Analyze existing results")
     else:
         # Default: show menu
@@ -178,7 +255,7 @@ if __name__ == "__main__":
         print("\nAvailable commands:")
         print("  1. Quick test:    python main.py quick")
         print("  2. Full test:     python main.py full [iterations]")
-        print("  3. Custom test:   python main.py custom profile_1 profile_2 [iterations]")
+        print("  3. Custom test:   python main.py custom profile_1 profile_2 [--iterations N]")
         print("  4. Analyze:       python main.py analyze results_file.json")
         print("\nOr run interactively:")
         print()
@@ -193,6 +270,7 @@ if __name__ == "__main__":
             run_full_experiment(iterations_per_profile=iterations)
         elif choice == "3":
             print("\nAvailable profiles:")
+            from cv_variations import NAME_VARIATIONS
             for p in NAME_VARIATIONS:
                 print(f"  - {p['id']}: {p['description']}")
             profile_input = input("\nEnter profile IDs (space-separated): ").strip()
@@ -1,11 +1,19 @@
+import functools
+import string
+import sys
+
+from cv_variations import NAME_VARIATIONS, generate_cv
+
+# Everything before {cv} is the same for every profile, so the CV must stay last: prompts then share
+# a byte-identical prefix (instructions + job description) whose KV cache Ollama can reuse
 prompt_template = """
 You are an expert recruiter and HR analyst.
 Your task is to evaluate the *content only* of a CV that will be provided as plain text.
 Ignore layout, formatting, fonts, file type, and ATS parsing issues — evaluate strictly the textual information.
 
 Input:
-- CV content (plain text) → {cv}
-- Job description → {job_description}
+- Job description → provided below, before the CV
+- CV content (plain text) → provided at the end of this message
 
 Evaluation Criteria (content-only):
 
@@ -37,9 +45,8 @@ Then:
 - Compute the **total score /100**.
 - If job description is provided, compute a **match percentage** based on skills, experience, and relevance.
 
-Format the final answer in JSON:
+Answer with a single JSON object in this format, and nothing else:
 
-```json
 {{
   "completeness_score": 0,
   "experience_score": 0,
@@ -47,13 +54,58 @@ Format the final answer in JSON:
   "writing_score": 0,
   "consistency_score": 0,
   "total_score": 0,
-  "match_percentage": null,
+  "match_percentage": null
 }}
-```
 
 If the CV lacks enough information to evaluate a category, give a low score and explain why.
+
+Job description:
+{job_description}
+
+CV content:
+{cv}
 """
 
+def _compile_template(template):
+    """
+    Split a str.format template once into its literal chunks and field names.
+
+    Args:
+        template: Template with plain {name} fields (no format specs or conversions)
+
+    Returns:
+        Tuple of (literal chunks, field names); chunks[i] precedes fields[i] and chunks[-1] ends the text
+    """
+    chunks = [""]
+    fields = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        # parse() already turned escaped {{ }} into literal braces
+        chunks[-1] += literal
+        if field is not None:
+            fields.append(field)
+            chunks.append("")
+    return tuple(chunks), tuple(fields)
+
+
+# Precompiled form of prompt_template: str.format re-parses every placeholder and escaped
+# brace on each call, while rendering the chunks is a single join
+_CHUNKS, _FIELDS = _compile_template(prompt_template)
+assert _FIELDS == ("job_description", "cv"), "render_prompt must follow the template's field order"
+
+
+def render_prompt(cv, job_description):
+    """
+    Render the evaluation prompt for a CV and a job description.
+
+    Args:
+        cv: CV content (plain text)
+        job_description: Job description text
+
+    Returns:
+        The formatted prompt, identical to prompt_template.format(cv=..., job_description=...)
+    """
+    return "".join((_CHUNKS[0], job_description, _CHUNKS[1], cv, _CHUNKS[2]))
+
 cv = """
 MOHAMED JBILOU
 linkedin.com/in/mohamed-jbilou
@@ -166,4 +218,40 @@ En tant que stagiaire Deep Learning Scientist, votre périmètre comprendra, san
  → Vous avez une appétence la mise en œuvre d'outils de ML Engineering et de pratiques visant d'accroître l'efficacité de nos process.
 
 Si vous ne remplissez pas 100% des critères ci-dessus, pas de panique, vous pouvez nous indiquer les raisons pour lesquelles vous pensez tout de même être un bon candidat pour ce rôle !
-"""
\ No newline at end of file
+"""
+
+# A single shared object, however many prompts or experiments reference it
+job_description = sys.intern(job_description)
+
+# Job descriptions prompts can be rendered against, by key
+JOB_DESCRIPTIONS = {"default": job_description}
+
+_PROFILES_BY_ID = {profile["id"]: profile for profile in NAME_VARIATIONS}
+
+
+@functools.lru_cache(maxsize=256)
+def render_profile_prompt(profile_id, job_key="default"):
+    """
+    Render (once, then from cache) the evaluation prompt of a NAME_VARIATIONS profile.
+
+    Args:
+        profile_id: ID of the profile in NAME_VARIATIONS (e.g. "profile_1")
+        job_key: Key of the job description in JOB_DESCRIPTIONS (default: "default")
+
+    Returns:
+        The formatted prompt, as render_prompt(generate_cv(profile), job_description) would build it
+    """
+    return render_prompt(generate_cv(_PROFILES_BY_ID[profile_id]), JOB_DESCRIPTIONS[job_key])
+
+
+def is_known_profile(profile):
+    """
+    Check whether a profile is one of NAME_VARIATIONS, unmodified, so render_profile_prompt can be used for it.
+
+    Args:
+        profile: Profile dictionary
+
+    Returns:
+        True if NAME_VARIATIONS holds an identical profile with the same ID
+    """
+    return _PROFILES_BY_ID.get(profile["id"]) == profile
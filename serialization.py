@@ -0,0 +1,100 @@
+"""
+Serialization helpers for experiment results.
+JSON uses orjson when it is installed and falls back to the standard library otherwise;
+the binary msgpack format requires the optional msgpack package.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def json_loads(data: bytes) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: Raw JSON as bytes, str or a buffer such as a memoryview over an mmap
+
+    Returns:
+        The decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _to_builtin(obj: Any) -> Any:
+    """Convert NumPy arrays and scalars (e.g. analyzer statistics) for the standard library encoder."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON. NumPy arrays and scalars are written as plain numbers.
+
+    Args:
+        obj: Object to serialize
+        indent: Whether to pretty-print with a two-space indent
+
+    Returns:
+        The encoded JSON document as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=_to_builtin).encode("utf-8")
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise ImportError("The msgpack format requires the msgpack package (pip install msgpack)")
+
+
+def msgpack_dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to msgpack.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        The packed bytes
+
+    Raises:
+        ImportError: If msgpack is not installed
+    """
+    _require_msgpack()
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def msgpack_loads(data: bytes) -> Any:
+    """
+    Parse a msgpack document.
+
+    Args:
+        data: Packed bytes (or a buffer such as a memoryview)
+
+    Returns:
+        The decoded Python object
+
+    Raises:
+        ImportError: If msgpack is not installed
+    """
+    _require_msgpack()
+    return msgpack.unpackb(data, raw=False)
@@ -0,0 +1,76 @@
+"""
+Per-column statistics for score matrices (rows = iterations, columns = score keys).
+Uses a Numba-compiled Welford pass for large matrices when numba is installed,
+and plain NumPy reductions otherwise.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Below this many cells the NumPy reductions beat dispatching to the JIT kernel
+NUMBA_MIN_CELLS = 10_000
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _welford_columns(mat):
+        """Return a (4, k) array of mean, stdev, min and max per column, skipping NaN cells."""
+        n_rows, n_cols = mat.shape
+        out = np.empty((4, n_cols))
+        for j in prange(n_cols):
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            low = np.inf
+            high = -np.inf
+            for i in range(n_rows):
+                value = mat[i, j]
+                if np.isnan(value):
+                    continue
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+                low = min(low, value)
+                high = max(high, value)
+            out[0, j] = mean
+            out[1, j] = np.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+            out[2, j] = low
+            out[3, j] = high
+        return out
+
+
+def column_stats(mat: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute per-column statistics of a score matrix, ignoring NaN cells.
+
+    Args:
+        mat: 2D float64 array where every column holds at least one non-NaN value
+
+    Returns:
+        Dictionary mapping mean, median, stdev, min and max to 1D arrays (one entry per column)
+    """
+    if njit is not None and mat.size >= NUMBA_MIN_CELLS:
+        means, stdevs, mins, maxs = _welford_columns(np.ascontiguousarray(mat))
+        medians = np.nanmedian(mat, axis=0)
+    else:
+        counts = np.count_nonzero(~np.isnan(mat), axis=0)
+        means = np.nanmean(mat, axis=0)
+        squared_dev = np.nansum((mat - means) ** 2, axis=0)
+        stdevs = np.sqrt(np.divide(squared_dev, counts - 1, out=np.zeros_like(squared_dev), where=counts > 1))
+        # One partition pass yields min, median and max together
+        mins, medians, maxs = np.nanpercentile(mat, [0, 50, 100], axis=0)
+
+    return {
+        "mean": means,
+        "median": medians,
+        "stdev": stdevs,
+        "min": mins,
+        "max": maxs
+    }
@@ -1,7 +1,8 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import os
 from pathlib import Path
 
@@ -28,24 +29,68 @@ else:
     st.error("No CSV files found in the results directory!")
     st.stop()
 
+# Columns of the summary CSV (see ATSAnalyzer.export_summary_csv) used by the page
+SUMMARY_COLUMNS = ["profile_id", "description", "iterations", "mean_total_score",
+                   "stdev_total_score", "min_total_score", "max_total_score"]
+
 # Load data
-@st.cache_data
+@st.cache_data(ttl=None, max_entries=8)
 def load_data(filename):
-    df = pd.read_csv(f"results/{filename}")
+    path = results_dir / filename
+    try:
+        # Arrow-backed columns parse faster and are cheaper for Streamlit to re-serialize
+        df = pd.read_csv(path, usecols=SUMMARY_COLUMNS, engine="pyarrow", dtype_backend="pyarrow")
+    except ImportError:
+        # pyarrow is not installed
+        df = pd.read_csv(path, usecols=SUMMARY_COLUMNS)
+    # Categorical IDs (in file order) make the profile filter a lookup on small integer codes
+    df['profile_id'] = df['profile_id'].astype(pd.CategoricalDtype(df['profile_id'].unique()))
     return df
 
 df = load_data(selected_file)
+profile_list = df['profile_id'].cat.categories.tolist()
+
+
+# Summary metrics are only recomputed when the file or the profile selection changes,
+# not on every rerun of the script
+@st.cache_data(max_entries=32)
+def compute_summary(filename, profiles):
+    summary_df = load_data(filename)
+    summary_df = summary_df[summary_df['profile_id'].isin(set(profiles))]
+    # Plain floats, so an empty selection aggregates to NaN (Arrow-backed columns would give pd.NA)
+    stats = summary_df[['mean_total_score', 'max_total_score', 'min_total_score']].astype(float).agg({
+        'mean_total_score': 'mean',
+        'max_total_score': 'max',
+        'min_total_score': 'min'
+    })
+    return {
+        "mean": float(stats['mean_total_score']),
+        "max": float(stats['max_total_score']),
+        "min": float(stats['min_total_score']),
+        "score_range": (summary_df['max_total_score'] - summary_df['min_total_score']).to_numpy(dtype=float)
+    }
+
+
+# The Styler computes a CSS rule per cell, so the styled table is rendered to HTML once
+# per file and profile selection, with the same key as compute_summary
+@st.cache_data(max_entries=32)
+def styled_html(filename, profiles):
+    table_df = load_data(filename)
+    table_df = table_df[table_df['profile_id'].isin(set(profiles))]
+    return table_df.style.background_gradient(subset=['mean_total_score'], cmap='YlGn').to_html()
+
 
 # Sidebar filters
 st.sidebar.header("Filters")
 selected_profiles = st.sidebar.multiselect(
     "Select Profiles",
-    options=df['profile_id'].tolist(),
-    default=df['profile_id'].tolist()
+    options=profile_list,
+    default=profile_list
 )
 
 # Filter dataframe
-filtered_df = df[df['profile_id'].isin(selected_profiles)]
+filtered_df = df[df['profile_id'].isin(set(selected_profiles))]
+summary = compute_summary(selected_file, tuple(sorted(selected_profiles)))
 
 # Display summary statistics
 st.header("📊 Summary Statistics")
@@ -54,109 +99,85 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     st.metric("Total Profiles", len(filtered_df))
 with col2:
-    st.metric("Avg Mean Score", f"{filtered_df['mean_total_score'].mean():.1f}")
+    st.metric("Avg Mean Score", f"{summary['mean']:.1f}")
 with col3:
-    st.metric("Highest Score", f"{filtered_df['max_total_score'].max():.0f}")
+    st.metric("Highest Score", f"{summary['max']:.0f}")
 with col4:
-    st.metric("Lowest Score", f"{filtered_df['min_total_score'].min():.0f}")
+    st.metric("Lowest Score", f"{summary['min']:.0f}")
 
 st.markdown("---")
 
-# Main visualizations
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("Mean Total Scores by Profile")
-    fig1 = px.bar(
-        filtered_df,
-        x='profile_id',
-        y='mean_total_score',
-        error_y='stdev_total_score',
-        hover_data=['description'],
-        color='mean_total_score',
-        color_continuous_scale='Viridis',
-        labels={'mean_total_score': 'Mean Score', 'profile_id': 'Profile'}
-    )
-    fig1.update_layout(showlegend=False, height=400)
-    st.plotly_chart(fig1, use_container_width=True)
-
-with col2:
-    st.subheader("Score Range (Min-Max) by Profile")
-    fig2 = go.Figure()
-    
-    for idx, row in filtered_df.iterrows():
-        fig2.add_trace(go.Box(
-            y=[row['min_total_score'], row['mean_total_score'], row['max_total_score']],
-            name=row['profile_id'],
-            boxmean=True
-        ))
-    
-    fig2.update_layout(
-        yaxis_title="Score",
-        xaxis_title="Profile",
-        showlegend=False,
-        height=400
-    )
-    st.plotly_chart(fig2, use_container_width=True)
-
-# Variability analysis
-st.markdown("---")
-st.subheader("Score Variability Analysis")
+# Main visualizations: all five charts in one figure, so the page sends and renders a single plot
+st.subheader("📈 Score Charts")
+
+fig = make_subplots(
+    rows=3, cols=2,
+    specs=[[{}, {}], [{}, {}], [{"colspan": 2}, None]],
+    subplot_titles=(
+        "Mean Total Scores by Profile",
+        "Score Range (Min-Max) by Profile",
+        "Mean Score vs. Variability",
+        "Score Range by Profile",
+        "Detailed Score Comparison"
+    ),
+    vertical_spacing=0.08
+)
 
-col1, col2 = st.columns(2)
+# Profile axis shared by every per-profile trace, converted from the DataFrame once
+profile_x = filtered_df['profile_id'].to_numpy(dtype=object)
 
-with col1:
-    fig3 = px.scatter(
-        filtered_df,
-        x='mean_total_score',
-        y='stdev_total_score',
-        size='iterations',
-        hover_data=['profile_id', 'description'],
-        color='profile_id',
-        labels={
-            'mean_total_score': 'Mean Score',
-            'stdev_total_score': 'Standard Deviation',
-            'iterations': 'Iterations'
-        },
-        title="Mean Score vs. Variability"
-    )
-    fig3.update_layout(height=400)
-    st.plotly_chart(fig3, use_container_width=True)
-
-with col2:
-    # Score range (max - min)
-    filtered_df_copy = filtered_df.copy()
-    filtered_df_copy['score_range'] = filtered_df_copy['max_total_score'] - filtered_df_copy['min_total_score']
-    
-    fig4 = px.bar(
-        filtered_df_copy,
-        x='profile_id',
-        y='score_range',
-        hover_data=['description'],
-        color='score_range',
-        color_continuous_scale='RdYlGn_r',
-        labels={'score_range': 'Score Range', 'profile_id': 'Profile'},
-        title="Score Range by Profile"
-    )
-    fig4.update_layout(showlegend=False, height=400)
-    st.plotly_chart(fig4, use_container_width=True)
+# Mean total scores (with standard deviation)
+fig.add_trace(go.Bar(
+    x=profile_x,
+    y=filtered_df['mean_total_score'],
+    error_y=dict(type='data', array=filtered_df['stdev_total_score'], visible=True),
+    hovertext=filtered_df['description'],
+    marker=dict(color=filtered_df['mean_total_score'], colorscale='Viridis'),
+    showlegend=False
+), row=1, col=1)
+
+# One trace for all profiles: each profile's (min, mean, max) becomes one box at its x position
+ys = filtered_df[['min_total_score', 'mean_total_score', 'max_total_score']].to_numpy(dtype=float).ravel()
+xs = np.repeat(profile_x, 3)
+fig.add_trace(go.Box(x=xs, y=ys, boxmean=True, showlegend=False), row=1, col=2)
+
+# Mean score vs. variability, marker area proportional to the number of iterations
+fig.add_trace(go.Scatter(
+    x=filtered_df['mean_total_score'],
+    y=filtered_df['stdev_total_score'],
+    mode='markers',
+    text=profile_x,
+    hovertext=filtered_df['description'],
+    marker=dict(
+        size=filtered_df['iterations'],
+        sizemode='area',
+        sizeref=2.0 * filtered_df['iterations'].to_numpy(dtype=float).max(initial=1) / (20 ** 2),
+        color=np.arange(len(filtered_df)),
+        colorscale='Plotly3'
+    ),
+    showlegend=False
+), row=2, col=1)
+
+# Score range (max - min)
+fig.add_trace(go.Bar(
+    x=profile_x,
+    y=summary['score_range'],
+    hovertext=filtered_df['description'],
+    marker=dict(color=summary['score_range'], colorscale='RdYlGn', reversescale=True),
+    showlegend=False
+), row=2, col=2)
 
 # Detailed comparison
-st.markdown("---")
-st.subheader("Detailed Score Comparison")
-
-fig5 = go.Figure()
-
-fig5.add_trace(go.Bar(
+fig.add_trace(go.Bar(
     name='Minimum',
-    x=filtered_df['profile_id'],
+    x=profile_x,
     y=filtered_df['min_total_score'],
     marker_color='lightblue'
-))
+), row=3, col=1)
 
-fig5.add_trace(go.Bar(
+fig.add_trace(go.Bar(
     name='Mean',
-    x=filtered_df['profile_id'],
+    x=profile_x,
     y=filtered_df['mean_total_score'],
     marker_color='blue',
     error_y=dict(
@@ -164,39 +185,40 @@ fig5.add_trace(go.Bar(
         array=filtered_df['stdev_total_score'],
         visible=True
     )
-))
+), row=3, col=1)
 
-fig5.add_trace(go.Bar(
+fig.add_trace(go.Bar(
     name='Maximum',
-    x=filtered_df['profile_id'],
+    x=profile_x,
     y=filtered_df['max_total_score'],
     marker_color='darkblue'
-))
-
-fig5.update_layout(
-    barmode='group',
-    xaxis_title="Profile",
-    yaxis_title="Score",
-    height=500,
-    hovermode='x unified'
-)
-
-st.plotly_chart(fig5, use_container_width=True)
+), row=3, col=1)
+
+fig.update_xaxes(title_text="Profile", row=1, col=1)
+fig.update_yaxes(title_text="Mean Score", row=1, col=1)
+fig.update_xaxes(title_text="Profile", row=1, col=2)
+fig.update_yaxes(title_text="Score", row=1, col=2)
+fig.update_xaxes(title_text="Mean Score", row=2, col=1)
+fig.update_yaxes(title_text="Standard Deviation", row=2, col=1)
+fig.update_xaxes(title_text="Profile", row=2, col=2)
+fig.update_yaxes(title_text="Score Range", row=2, col=2)
+fig.update_xaxes(title_text="Profile", row=3, col=1)
+fig.update_yaxes(title_text="Score", row=3, col=1)
+fig.update_layout(barmode='group', height=1300)
+
+st.plotly_chart(fig, use_container_width=True)
 
 # Data table
 st.markdown("---")
 st.subheader("📋 Raw Data")
-st.dataframe(
-    filtered_df.style.background_gradient(subset=['mean_total_score'], cmap='YlGn'),
-    use_container_width=True
-)
+st.markdown(styled_html(selected_file, tuple(sorted(selected_profiles))), unsafe_allow_html=True)
 
 # Profile descriptions
 st.markdown("---")
 st.subheader("Profile Descriptions")
-for idx, row in filtered_df.iterrows():
-    with st.expander(f"{row['profile_id']} - Mean Score: {row['mean_total_score']:.1f}"):
-        st.write(f"**Description:** {row['description']}")
-        st.write(f"**Iterations:** {row['iterations']}")
-        st.write(f"**Score Range:** {row['min_total_score']:.0f} - {row['max_total_score']:.0f}")
-        st.write(f"**Standard Deviation:** {row['stdev_total_score']:.2f}")
+for row in filtered_df.itertuples(index=False):
+    with st.expander(f"{row.profile_id} - Mean Score: {row.mean_total_score:.1f}"):
+        st.write(f"**Description:** {row.description}")
+        st.write(f"**Iterations:** {row.iterations}")
+        st.write(f"**Score Range:** {row.min_total_score:.0f} - {row.max_total_score:.0f}")
+        st.write(f"**Standard Deviation:** {row.stdev_total_score:.2f}")
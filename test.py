@@ -1,17 +1,23 @@
 import ollama
 
-print("initiating streaming chat...")
+from prompt import render_profile_prompt
+from serialization import json_loads
 
+print("initiating chat...")
+
+# Same call shape as the experiment's evaluator: one non-streamed answer constrained to JSON,
+# with a bounded answer length and context window
 response = ollama.chat(
     model="deepseek-r1",
     options={
         "temperature": 0.2,  # consistent grading
+        "num_predict": 512,  # the JSON scores need far fewer tokens
+        "num_ctx": 4096,  # fits the evaluation prompt plus the answer
     },
-    messages=[{"role": "user", "content": "Hello, Ollama!"}],
-    stream=True
+    messages=[{"role": "user", "content": render_profile_prompt("profile_1")}],
+    format="json",
+    stream=False
 )
 
-print("streaming response:")
-
-for chunk in response:
-    print(chunk['message']['content'], end='', flush=True)
+print("response:")
+print(json_loads(response['message']['content']))